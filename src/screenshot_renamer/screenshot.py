@@ -3,20 +3,29 @@ Screenshotter
 """
 
 import argparse
-from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                as_completed, wait)
+from contextlib import contextmanager, suppress
+import errno
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache, partial
 import hashlib
 import logging
 import os
-import pathlib
 import re
-import shutil
+import signal
 import sys
-from time import sleep
-from typing import List
+import threading
+from typing import (Dict, FrozenSet, Iterable, Iterator, List, Optional,
+                    Tuple)
 
 import pytz
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemEvent, LoggingEventHandler
+from watchdog.observers.api import BaseObserver
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (FileSystemEvent, LoggingEventHandler,
+                             PatternMatchingEventHandler)
 
 from screenshot_renamer import __version__
 
@@ -26,18 +35,128 @@ __license__ = "MIT"
 
 _logger = logging.getLogger(__name__)
 
+
+_SHA256_CPU_FEATURES: FrozenSet[str] = frozenset({'sha_ni', 'avx2', 'sha2'})
+""" CPU feature flags (x86-64 and ARM) that SHA-256 kernels can make use of. """
+
+
+def _cpu_sha256_features() -> List[str]:
+    """Find the CPU features that can speed up SHA-256, from ``/proc/cpuinfo``.
+
+    :return: Sorted feature flags found, empty if none or if they can't be
+        determined (e.g. on platforms other than Linux).
+    :rtype: List[str]
+    """
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as fh:
+            for line in fh:
+                name, _, value = line.partition(':')
+                # x86 lists "flags", ARM lists "Features"; one CPU is enough.
+                if name.strip() in ('flags', 'Features'):
+                    return sorted(_SHA256_CPU_FEATURES.intersection(value.split()))
+    except OSError:
+        pass
+    return []
+
+
+def _sha256_backend() -> str:
+    """Describe the implementation backing :func:`hashlib.sha256`.
+
+    When hashlib is bound to OpenSSL, OpenSSL dispatches to SHA extension
+    (SHA-NI) or SIMD kernels at runtime based on the CPU, so there is no need
+    to go looking for a faster implementation elsewhere.
+
+    :return: Human readable name of the SHA-256 backend, along with any CPU
+        features it can make use of.
+    :rtype: str
+    """
+    if getattr(hashlib.sha256, '__name__', '') == 'openssl_sha256':
+        try:
+            import ssl
+            backend = ssl.OPENSSL_VERSION
+        except ImportError:
+            backend = 'OpenSSL'
+        features = _cpu_sha256_features()
+        if features:
+            backend += ' (CPU: {})'.format(', '.join(features))
+        return backend
+    return 'Python builtin'
+
+
+_sha256 = hashlib.sha256
+""" Factory for SHA-256 hash objects used for checksums. """
+
+_SHA256_BACKEND: str = _sha256_backend()
+""" Description of the backend behind :data:`_sha256`. """
+
+
+@lru_cache(maxsize=None)
+def _timezone(name: str) -> tzinfo:
+    """Look up a timezone by name, caching the result for later calls.
+
+    :param name: Timezone name, e.g. ``UTC`` or ``America/Los_Angeles``.
+    :type name: str
+    :return: The matching timezone.
+    :rtype: tzinfo
+    """
+    if name == 'UTC':
+        return timezone.utc
+    return pytz.timezone(name)
+
+
+def _move_no_clobber(path: str, new_path: str) -> None:
+    """Move a file within a filesystem, refusing to replace an existing file.
+
+    :param path: Path of the file to move.
+    :type path: str
+    :param new_path: Path to move the file to.
+    :type new_path: str
+    :raises FileExistsError: If ``new_path`` already exists.
+    :raises FileNotFoundError: If ``path`` no longer exists.
+    """
+    try:
+        # Linking fails atomically if the destination exists, so there's no
+        # window between checking for it and moving the file.
+        os.link(path, new_path)
+    except (FileExistsError, FileNotFoundError):
+        raise
+    except OSError:
+        # Not every filesystem supports hard links (FAT, some network
+        # shares), so fall back to checking first and renaming.
+        if os.path.exists(new_path):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST),
+                                  new_path)
+        os.rename(path, new_path)
+        return
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        # Something else removed the old name after we linked it; the file
+        # is at its new name either way, so the move is done.
+        pass
+    except OSError:
+        # Don't leave the file under both names; undo the link and report
+        # the original failure.
+        with suppress(OSError):
+            os.unlink(new_path)
+        raise
+
 # ---- Python API ----
 
-class RenamerHandler(FileSystemEventHandler):
+class RenamerHandler(PatternMatchingEventHandler):
     #############################
     #  === CLASS CONSTANTS ===  #
     #############################
 
-    # Not in use right now - Still not sure what's the right number of blocks
-    # to use, but the screenshots are small enough that this isn't an issue at
-    # the moment
-    # READ_BYTES_FOR_HASH: int = 1048576
-    """ Bytes to read to calculate our hash."""
+    READ_BYTES_FOR_HASH: int = 1048576
+    """ Bytes to read at a time while calculating our hash. """
+
+    HASH_CACHE_SIZE: int = 128
+    """ Number of recent partial checksums to remember. """
+
+    HASH_BUFFERS_KEPT: int = min(8, os.cpu_count() or 1)
+    """ Most idle read buffers to keep around for reuse; any more are freed. """
 
     CONSTRUCT_FN: str = 'Screenshot-{datetime}-{checksum}{ext}'
     """ File name template for constructing new filename """
@@ -45,19 +164,50 @@ class RenamerHandler(FileSystemEventHandler):
     USE_DATETIME_TIMEZONE: str = "UTC"
     """ Timezone string to use for file date. """
 
-    VALID_EXTS: List[str] = ['.png', '.jpg', '.jpeg']
-    """ Extensions to operate on. """
+    VALID_EXTS: FrozenSet[str] = frozenset({'.png', '.jpg', '.jpeg'})
+    """ Extensions to operate on, in lowercase. """
+
+    RENAME_DELAY_SECONDS: float = 1.0
+    """ Seconds a file must go without further events before it is renamed. """
 
     VALID_FN: re.Pattern = re.compile(r'Screenshot-'
                                     r'(?P<datetime>[0-9]{8}-[0-9]{6})-'
                                     r'(?P<checksum>[0-9A-Fa-f]{8})'
-                                    r'\..*')
-    """ Regular expression to check whether file name pattern matches. """
+                                    r'\.[A-Za-z0-9]+')
+    """ Regular expression to check whether file name pattern matches. Used with
+    :meth:`re.Pattern.fullmatch`, so it must cover the whole name. """
+
+    _hash_cache: 'OrderedDict[Tuple[int, int, int, int], str]' = OrderedDict()
+    """ Partial checksums keyed by file device, inode, mtime and size. """
+
+    _hash_cache_lock = threading.Lock()
+
+    _hash_buffers: List[bytearray] = []
+    """ Read buffers not currently in use by :meth:`checksum_partial`. """
+
+    _hash_buffers_lock = threading.Lock()
 
     #####################
     #  === METHODS ===  #
     #####################
 
+    def __init__(self, rename_delay: Optional[float] = None) -> None:
+        """
+        :param rename_delay: Seconds to wait before renaming, overriding
+            :attr:`RENAME_DELAY_SECONDS` for this handler.
+        :type rename_delay: Optional[float]
+        """
+        # Let watchdog drop directory events and files we don't care about
+        # before they ever get dispatched to our handlers.
+        super().__init__(
+            patterns=['*' + ext for ext in sorted(self.VALID_EXTS)],
+            ignore_directories=True,
+            case_sensitive=False,
+        )
+        self.rename_delay = rename_delay
+        self._pending: Dict[str, threading.Timer] = {}
+        self._pending_lock = threading.Lock()
+
     @classmethod
     def needs_rename(cls, path: str) -> bool:
         """Determines whether a file needs to be renamed, according to the
@@ -68,7 +218,7 @@ class RenamerHandler(FileSystemEventHandler):
         :return: Whether the file needs to be renamed: True if yes, False if no.
         :rtype: bool
         """
-        return not bool(cls.VALID_FN.match(os.path.basename(path)))
+        return not bool(cls.VALID_FN.fullmatch(os.path.basename(path)))
 
     @classmethod
     def checksum_partial(cls, path: str) -> str:
@@ -80,16 +230,64 @@ class RenamerHandler(FileSystemEventHandler):
         :return: Partial checksum of the file, calculated from a full checksum
         :rtype: str
         """
-        with open(path, 'rb') as fh:
-            # data = fh.read(cls.READ_BYTES_FOR_HASH)
-            data = fh.read()
-            checksum = hashlib.sha256(data).hexdigest()
-        partial = checksum[-8:]
-        # _logger.debug('%s: SHA-256 for first %d bytes: %s, partial: %s',
-        #                 path, cls.READ_BYTES_FOR_HASH, checksum, partial)
+        # Unbuffered, so readinto() fills our buffer straight from the file.
+        with open(path, 'rb', buffering=0) as fh:
+            # Duplicate events for a file that hasn't changed since it was last
+            # hashed can reuse the earlier result instead of reading it again.
+            st = os.fstat(fh.fileno())
+            key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+            with cls._hash_cache_lock:
+                partial_checksum = cls._hash_cache.get(key)
+                if partial_checksum is not None:
+                    cls._hash_cache.move_to_end(key)
+            if partial_checksum is not None:
+                _logger.debug('%s: Cached partial checksum: %s',
+                              path, partial_checksum)
+                return partial_checksum
+
+            # Stream the file through the hash in fixed-size chunks, so memory
+            # use stays bounded regardless of the size of the screenshot.
+            with cls._hash_buffer() as buf, memoryview(buf) as view:
+                hasher = _sha256()
+                # An unbuffered read can come back short before end of file
+                # (e.g. on network or FUSE mounts), so keep reading until it
+                # returns nothing.
+                for size in iter(partial(fh.readinto, buf), 0):
+                    hasher.update(view[:size])
+        checksum = hasher.hexdigest()
+        partial_checksum = checksum[-8:]
         _logger.debug('%s: SHA-256: %s, partial: %s',
-                        path, checksum, partial)
-        return partial
+                        path, checksum, partial_checksum)
+
+        with cls._hash_cache_lock:
+            cls._hash_cache[key] = partial_checksum
+            while len(cls._hash_cache) > cls.HASH_CACHE_SIZE:
+                cls._hash_cache.popitem(last=False)
+        return partial_checksum
+
+    @classmethod
+    @contextmanager
+    def _hash_buffer(cls) -> Iterator[bytearray]:
+        """Borrow a :attr:`READ_BYTES_FOR_HASH` sized buffer to read files into
+        for hashing, so that each checksum doesn't allocate a new one.
+        Buffers are pooled rather than kept per thread, since each scheduled
+        rename runs on a short-lived timer thread.
+
+        :return: Context manager giving a buffer, returned to the pool on exit.
+        :rtype: Iterator[bytearray]
+        """
+        with cls._hash_buffers_lock:
+            buf = cls._hash_buffers.pop() if cls._hash_buffers else None
+        if buf is None or len(buf) != cls.READ_BYTES_FOR_HASH:
+            buf = bytearray(cls.READ_BYTES_FOR_HASH)
+        try:
+            yield buf
+        finally:
+            # Bursts can borrow more buffers than usual; let the extras go
+            # rather than holding on to them for good.
+            with cls._hash_buffers_lock:
+                if len(cls._hash_buffers) < cls.HASH_BUFFERS_KEPT:
+                    cls._hash_buffers.append(buf)
 
     @classmethod
     def file_datetime(cls, path: str) -> str:
@@ -102,28 +300,33 @@ class RenamerHandler(FileSystemEventHandler):
             declared.
         :rtype: str
         """
-        mod_time = pathlib.Path(path).stat().st_mtime
+        mod_time = os.stat(path).st_mtime
         datetime_obj = datetime.fromtimestamp(
             mod_time,
-            tz=pytz.timezone(cls.USE_DATETIME_TIMEZONE)
+            tz=_timezone(cls.USE_DATETIME_TIMEZONE)
         )
-        iso8601_datetime = datetime_obj.isoformat()
         return_datetime = datetime_obj.strftime('%Y%m%d-%H%M%S')
-        _logger.debug('%s: Modified Date/Time: %s, Filename Partial: %s',
-                    path, iso8601_datetime, return_datetime)
+        # The ISO 8601 form is only for logging, so skip building it otherwise.
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug('%s: Modified Date/Time: %s, Filename Partial: %s',
+                        path, datetime_obj.isoformat(), return_datetime)
         return return_datetime
 
-    def new_filename(self, path: str) -> str:
+    def new_filename(self, path: str, ext: Optional[str] = None) -> str:
         """Generate a new filename for a given file, given the current filename.
 
         :param path: Path to the file in question.
         :type path: str
+        :param ext: Extension of the file, if already known. Determined from
+            ``path`` when not given.
+        :type ext: Optional[str]
         :return: The new filename to give the file.
         :rtype: str
         """
         file_date = self.file_datetime(path)
         file_cksum = self.checksum_partial(path)
-        ext = os.path.splitext(os.path.basename(path))[-1]
+        if ext is None:
+            ext = os.path.splitext(path)[1]
         return self.CONSTRUCT_FN.format(datetime=file_date, checksum=file_cksum, ext=ext)
 
     def rename(self, path: str, new_filename: str) -> bool:
@@ -138,32 +341,140 @@ class RenamerHandler(FileSystemEventHandler):
         """
 
         new_path = os.path.join(os.path.dirname(path), new_filename)
-        if os.path.exists(new_path):
+        try:
+            _move_no_clobber(path, new_path)
+        except FileExistsError:
             _logger.error('File %s -> %s already exists, cannot move.',
                         path, new_path)
             return False
-        
-        # @TODO: Exception handling.
-        if os.path.exists(path):
-            shutil.move(path, new_path)
+        except FileNotFoundError:
+            _logger.debug('%s: No longer exists, not renaming.', path)
+            return False
+        except OSError as err:
+            _logger.error('Unable to move %s -> %s: %s', path, new_path, err)
+            return False
         _logger.info('Moved: %s -> %s', path, new_path)
         return True
 
+    def rename_file(self, path: str, ext: Optional[str] = None) -> bool:
+        """Rename a file to match the filename rules in use.
+
+        :param path: Path of the file in question.
+        :type path: str
+        :param ext: Extension of the file, if already known.
+        :type ext: Optional[str]
+        :return: Whether the file rename was successful.
+        :rtype: bool
+        """
+        try:
+            new_fn = self.new_filename(path, ext)
+        except FileNotFoundError:
+            _logger.debug('%s: No longer exists, not renaming.', path)
+            return False
+        except OSError as err:
+            _logger.error('Unable to read %s for renaming: %s', path, err)
+            return False
+        return self.rename(path, new_fn)
+
+    def schedule_rename(self, path: str, ext: Optional[str] = None) -> None:
+        """Schedule a file to be renamed once it has gone
+        :attr:`RENAME_DELAY_SECONDS` (or ``rename_delay``, when given to the
+        handler) without further events. Scheduling a path that is already
+        pending restarts its wait.
+
+        :param path: Path of the file in question.
+        :type path: str
+        :param ext: Extension of the file, if already known.
+        :type ext: Optional[str]
+        """
+        delay = self.rename_delay
+        if delay is None:
+            delay = self.RENAME_DELAY_SECONDS
+        with self._pending_lock:
+            self._start_timer(path, ext, delay)
+
+    def is_pending(self, path: str) -> bool:
+        """Check whether a file has a scheduled rename that hasn't run yet.
+
+        :param path: Path of the file in question.
+        :type path: str
+        :return: Whether a rename is pending for the file.
+        :rtype: bool
+        """
+        with self._pending_lock:
+            return path in self._pending
+
+    def run_pending(self, path: str) -> bool:
+        """Run a scheduled rename right away, rather than waiting out the rest
+        of its delay. The rename still happens on a timer thread, so callers
+        such as watchdog's dispatch thread aren't held up by it.
+
+        :param path: Path of the file in question.
+        :type path: str
+        :return: Whether a rename was pending.
+        :rtype: bool
+        """
+        with self._pending_lock:
+            if path not in self._pending:
+                return False
+            self._start_timer(path, None, 0)
+        return True
+
+    def cancel_pending(self) -> None:
+        """Cancel any renames that have been scheduled but not yet run."""
+        with self._pending_lock:
+            for timer in self._pending.values():
+                timer.cancel()
+            self._pending.clear()
+
+    def _start_timer(self, path: str, ext: Optional[str],
+                     delay: float) -> None:
+        # Callers must hold _pending_lock.
+        previous = self._pending.get(path)
+        if previous is not None:
+            previous.cancel()
+        timer = threading.Timer(delay, self._run_scheduled_rename,
+                                args=(path, ext))
+        timer.daemon = True
+        self._pending[path] = timer
+        timer.start()
+
+    def _run_scheduled_rename(self, path: str, ext: Optional[str]) -> None:
+        with self._pending_lock:
+            # A later event may have replaced this timer after it already
+            # started running; only the current timer gets to rename.
+            if self._pending.get(path) is not threading.current_thread():
+                return
+            del self._pending[path]
+        try:
+            self.rename_file(path, ext)
+        except Exception:
+            _logger.exception('%s: Unable to rename.', path)
+
     def handle_event(self, event: FileSystemEvent) -> bool:
         """Take care of handling any file system event we're concerned with.
 
         :param event: The event from the file system.
         :type event: FileSystemEvent
-        :return: Whether the event did any renaming.
+        :return: Whether the event scheduled a rename.
         :rtype: bool
         """
-        path = event.src_path
         if event.is_directory:
-            _logger.debug('%s: Is a directory, not operating.', path)
+            _logger.debug('%s: Is a directory, not operating.', event.src_path)
             return False
+        return self.handle_path(event.src_path)
+
+    def handle_path(self, path: str) -> bool:
+        """Schedule a rename for a file that has appeared, if it is one we're
+        concerned with.
 
-        file_ext = os.path.splitext(os.path.basename(path))[-1].lower().strip()
-        if file_ext not in self.VALID_EXTS:
+        :param path: Path of the file in question.
+        :type path: str
+        :return: Whether a rename was scheduled.
+        :rtype: bool
+        """
+        ext = os.path.splitext(path)[1]
+        if ext.lower() not in self.VALID_EXTS:
             _logger.debug('%s: Not an extension of concern, not operating.', path)
             return False
 
@@ -172,10 +483,9 @@ class RenamerHandler(FileSystemEventHandler):
                           'needed.', path)
             return False
 
-        _logger.debug('Sleeping for 1 second before rename.')
-        sleep(1)
-        new_fn = self.new_filename(path)
-        return self.rename(path, new_fn)
+        _logger.debug('%s: Scheduling rename.', path)
+        self.schedule_rename(path, ext)
+        return True
 
     def on_created(self, event: FileSystemEvent) -> bool:
         """Fires when a file/directory is created, handles renaming files as
@@ -190,47 +500,354 @@ class RenamerHandler(FileSystemEventHandler):
         _logger.info('File creation detected: %s', event.src_path)
         return self.handle_event(event)
 
+    def on_modified(self, event: FileSystemEvent) -> bool:
+        """Fires when a file/directory is modified. Pushes back the rename of
+        a file that is still being written.
+
+        :param event: Event describing the action that occurred.
+        :type event: FileSystemEvent
+        :return: Whether a pending rename was pushed back.
+        :rtype: bool
+        """
+        path = event.src_path
+        if event.is_directory or not self.is_pending(path):
+            return False
+        _logger.debug('%s: Modified while pending, delaying rename.', path)
+        self.schedule_rename(path)
+        return True
+
+    def on_closed(self, event: FileSystemEvent) -> bool:
+        """Fires when a file opened for writing is closed (inotify only).
+        The writer is done at that point, so a pending rename runs right away.
+
+        :param event: Event describing the action that occurred.
+        :type event: FileSystemEvent
+        :return: Whether a pending rename was brought forward.
+        :rtype: bool
+        """
+        if event.is_directory:
+            return False
+        return self.run_pending(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> bool:
+        """Fires when a file/directory is moved or renamed. Files moved into
+        place are handled just like newly created ones.
+
+        :param event: Event describing the action that occurred.
+        :type event: FileSystemEvent
+        :return: Whether a rename was scheduled for the destination.
+        :rtype: bool
+        """
+        if event.is_directory:
+            return False
+        with self._pending_lock:
+            timer = self._pending.pop(event.src_path, None)
+        if timer is not None:
+            timer.cancel()
+        _logger.info('File move detected: %s -> %s',
+                     event.src_path, event.dest_path)
+        return self.handle_path(event.dest_path)
+
 ##############################################################################
 
 
-def handle_monitoring(paths: List[str], recursive: bool) -> bool:
+NETWORK_FS_TYPES: FrozenSet[str] = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'fuse.sshfs', '9p',
+})
+""" Filesystem types that don't reliably deliver inotify events. """
+
+POLLING_INTERVAL_SECONDS: float = 5.0
+""" Seconds between polls of paths on network filesystems. """
+
+
+def _filesystem_type(path: str,
+                     mounts_file: str = '/proc/mounts') -> Optional[str]:
+    """Find the type of the filesystem a path lives on, from ``/proc/mounts``.
+
+    :param path: Path in question.
+    :type path: str
+    :param mounts_file: Mount table to read, in ``/proc/mounts`` format.
+    :type mounts_file: str
+    :return: The filesystem type, or ``None`` if it can't be determined (e.g.
+        on platforms other than Linux).
+    :rtype: Optional[str]
+    """
+    try:
+        with open(mounts_file, encoding='utf-8') as fh:
+            mounts = fh.readlines()
+    except OSError:
+        return None
+
+    real_path = os.path.realpath(path)
+    best_mount, best_type = '', None
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        # Whitespace in mount points is escaped as octal, e.g. \040.
+        mount_point = re.sub(r'\\([0-7]{3})',
+                             lambda m: chr(int(m.group(1), 8)), fields[1])
+        if (real_path == mount_point
+                or real_path.startswith(mount_point.rstrip('/') + '/')) \
+                and len(mount_point) >= len(best_mount):
+            best_mount, best_type = mount_point, fields[2]
+    return best_type
+
+
+def _is_network_fs(path: str) -> bool:
+    """Check whether a path is on a network filesystem, where native file
+    system events can't be relied on and polling is needed instead.
+
+    :param path: Path in question.
+    :type path: str
+    :return: Whether the path is on a network filesystem.
+    :rtype: bool
+    """
+    return _filesystem_type(path) in NETWORK_FS_TYPES
+
+
+def _iter_existing(root: str, recursive: bool) -> Iterator[str]:
+    """Lazily yield the paths of files in a directory, so that work on them can
+    start before the whole tree has been listed.
+
+    :param root: Directory to scan.
+    :type root: str
+    :param recursive: Whether to descend into subdirectories.
+    :type recursive: bool
+    :return: Iterator over paths of files found.
+    :rtype: Iterator[str]
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                # DirEntry caches the file type from the directory listing,
+                # so these checks don't normally need an extra stat call.
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from _iter_existing(entry.path, recursive)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
+    except OSError as err:
+        _logger.error('%s: Unable to scan directory: %s', root, err)
+
+
+def _iter_scan_candidates(handler: RenamerHandler, paths: List[str],
+                          recursive: bool) -> Iterator[Tuple[str, str]]:
+    """Lazily find existing files in the given paths that need renaming.
+
+    :param handler: Handler whose rules decide what needs renaming.
+    :type handler: RenamerHandler
+    :param paths: Paths to scan, either files or directories.
+    :type paths: List[str]
+    :param recursive: Whether to scan directories recursively.
+    :type recursive: bool
+    :return: Iterator over the path and extension of each file to rename.
+    :rtype: Iterator[Tuple[str, str]]
+    """
+    for cur_path in paths:
+        if os.path.isdir(cur_path):
+            files = _iter_existing(cur_path, recursive)
+        else:
+            files = iter([cur_path])
+        for file_path in files:
+            ext = os.path.splitext(file_path)[1]
+            if ext.lower() not in handler.VALID_EXTS:
+                continue
+            # Files the watcher is already waiting on may still be written to.
+            if not handler.needs_rename(file_path) \
+                    or handler.is_pending(file_path):
+                continue
+            yield file_path, ext
+
+
+def scan_existing(handler: RenamerHandler, paths: List[str],
+                  recursive: bool, workers: Optional[int] = None,
+                  stop_event: Optional[threading.Event] = None) -> int:
+    """Rename files already present in the given paths.
+
+    Files are hashed and renamed on a pool of threads; hashlib releases the
+    GIL while hashing, so several files are worked on at once.
+
+    :param handler: Handler to rename files with.
+    :type handler: RenamerHandler
+    :param paths: Paths to scan, either files or directories.
+    :type paths: List[str]
+    :param recursive: Whether to scan directories recursively.
+    :type recursive: bool
+    :param workers: Number of files to work on at once. Defaults to the number
+        of CPUs, up to 8.
+    :type workers: Optional[int]
+    :param stop_event: When given and set, no further files are started on.
+    :type stop_event: Optional[threading.Event]
+    :return: Number of files renamed.
+    :rtype: int
+    """
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1)
+
+    renamed = 0
+    # Pending work, mapped to the path each one is renaming.
+    in_flight: Dict[Future, str] = {}
+
+    def collect(done: Iterable[Future]) -> None:
+        nonlocal renamed
+        for future in done:
+            file_path = in_flight.pop(future)
+            try:
+                renamed += future.result()
+            except Exception:
+                # One bad file shouldn't end the scan for the rest.
+                _logger.exception('%s: Unable to rename.', file_path)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file_path, ext in _iter_scan_candidates(handler, paths, recursive):
+            if stop_event is not None and stop_event.is_set():
+                _logger.info('Initial scan stopped before completion.')
+                break
+            # Only queue a few files ahead, so a large tree is never listed
+            # into memory all at once.
+            if len(in_flight) >= workers * 2:
+                collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+            future = executor.submit(handler.rename_file, file_path, ext)
+            in_flight[future] = file_path
+        collect(as_completed(list(in_flight)))
+    return renamed
+
+
+def handle_monitoring(paths: List[str], recursive: bool,
+                      initial_scan: bool = False) -> bool:
     """handle_monitoring _summary_
 
     :param paths: _description_
     :type paths: List[str]
     :param recursive: _description_
     :type recursive: bool
+    :param initial_scan: When set, also rename files already present in the
+        watched paths once watching has started.
+    :type initial_scan: bool
     :return: ``True`` upon completion.
     :rtype: bool
     """
-    event_handler = RenamerHandler()
-    # event_handler = LoggingEventHandler()
-    observer = Observer()
+    _logger.info('SHA-256 backend: %s', _SHA256_BACKEND)
+    # Native and polling observers, created as needed for the paths given,
+    # along with the handler and paths for each.
+    observers: Dict[bool, BaseObserver] = {}
+    handlers: Dict[bool, RenamerHandler] = {}
+    watched: Dict[bool, List[str]] = {}
     for cur_path in paths:
         if os.path.isdir(cur_path):
             use_recursive = recursive
         elif os.path.isfile(cur_path):
             use_recursive = False  # meaningless for files.
         else:
-            _logger.error('%s: not a directory or file, skipping.')
+            _logger.error('%s: not a directory or file, skipping.', cur_path)
             continue
 
-        _logger.info('%s: Scheduling for watch.', cur_path)
-        observer.schedule(event_handler, cur_path, recursive=use_recursive)
+        use_polling = _is_network_fs(cur_path)
+        observer = observers.get(use_polling)
+        if observer is None:
+            if use_polling:
+                observer = PollingObserver(timeout=POLLING_INTERVAL_SECONDS)
+                # Polling only reports a later write on the next snapshot,
+                # and never reports closes, so wait out at least one more
+                # poll before deciding a file is finished.
+                handlers[use_polling] = RenamerHandler(
+                    rename_delay=POLLING_INTERVAL_SECONDS
+                    + RenamerHandler.RENAME_DELAY_SECONDS)
+            else:
+                observer = Observer()
+                handlers[use_polling] = RenamerHandler()
+                # handlers[use_polling] = LoggingEventHandler()
+            observers[use_polling] = observer
+            watched[use_polling] = []
+
+        if use_polling:
+            _logger.info('%s: On a network filesystem, scheduling for polling '
+                         'every %s seconds.', cur_path, POLLING_INTERVAL_SECONDS)
+        else:
+            _logger.info('%s: Scheduling for watch.', cur_path)
+        observer.schedule(handlers[use_polling], cur_path,
+                          recursive=use_recursive)
+        watched[use_polling].append(cur_path)
+
+    # Block until asked to stop, rather than waking up every second to check
+    # on the observers.
+    stop_event = threading.Event()
+
+    def raise_interrupt(signum, frame):
+        # Signal handlers run on the main thread, possibly while it holds the
+        # stop event's internal lock, so they mustn't touch the event itself.
+        # Raise instead, and let the wait below turn it into a stop.
+        raise KeyboardInterrupt
+
+    def stop_when_finished(observer: BaseObserver) -> None:
+        # An observer thread that dies (e.g. from an unhandled error) would
+        # otherwise leave us waiting forever without watching anything.
+        observer.join()
+        stop_event.set()
+
+    # CTRL-C already raises KeyboardInterrupt; have SIGTERM do the same. Signal
+    # handlers can only be installed from the main thread.
+    previous_handlers = {}
+    on_main_thread = threading.current_thread() is threading.main_thread()
+    if on_main_thread:
+        previous_handlers[signal.SIGTERM] = signal.signal(signal.SIGTERM,
+                                                          raise_interrupt)
+    # Windows can't interrupt a blocking wait with CTRL-C, and off the main
+    # thread no signal will end it, so wake up periodically in those cases.
+    if sys.platform == 'win32' or not on_main_thread:
+        wait_timeout = 1
+    else:
+        wait_timeout = None
 
     print('Watching paths, Use CTRL-C to stop.')
 
-    observer.start()
-    _logger.debug(observer)
-    _logger.debug(observer.is_alive())
+    for observer in observers.values():
+        observer.start()
+        _logger.debug(observer)
+        _logger.debug(observer.is_alive())
+        threading.Thread(target=stop_when_finished, args=(observer,),
+                         daemon=True).start()
+
+    def run_initial_scan() -> None:
+        _logger.info('Scanning for existing files to rename.')
+        renamed = sum(
+            scan_existing(handlers[use_polling], watched[use_polling],
+                          recursive, stop_event=stop_event)
+            for use_polling in handlers
+        )
+        _logger.info('Initial scan renamed %d file(s).', renamed)
+
+    # Scan in the background, so that stopping isn't held up by a large tree.
+    scan_thread = None
+    if initial_scan:
+        scan_thread = threading.Thread(target=run_initial_scan, daemon=True)
 
     try:
-        while observer.is_alive():
-            observer.join(1)
+        if scan_thread is not None:
+            scan_thread.start()
+        try:
+            while not stop_event.wait(wait_timeout):
+                pass
+        except KeyboardInterrupt:
+            stop_event.set()
+        for observer in observers.values():
+            if not observer.is_alive():
+                _logger.error('%s: Stopped unexpectedly, no longer watching.',
+                              observer)
     finally:
-        _logger.debug('CTRL-C detected, closing out.')
-        observer.stop()
-        observer.join()
+        _logger.debug('Stop requested, closing out.')
+        stop_event.set()
+        if scan_thread is not None and scan_thread.is_alive():
+            scan_thread.join()
+        for sig, previous in previous_handlers.items():
+            signal.signal(sig, previous)
+        for handler in handlers.values():
+            handler.cancel_pending()
+        for observer in observers.values():
+            observer.stop()
+        for observer in observers.values():
+            observer.join()
         return True
 
 # ---- CLI ----
@@ -264,6 +881,14 @@ def parse_args(args: List[str]) -> argparse.Namespace:
         dest="recursive",
     )
 
+    parser.add_argument(
+        "-s",
+        "--initial-scan",
+        action="store_true",
+        help="When set, will also rename files already in the watched paths.",
+        dest="initial_scan",
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -315,7 +940,7 @@ def main(args: List[str]) -> int:
     args = parse_args(args)
     setup_logging(args.loglevel)
     _logger.info("Starting up monitoring.")
-    handle_monitoring(args.watch_paths, args.recursive)
+    handle_monitoring(args.watch_paths, args.recursive, args.initial_scan)
     _logger.info("Ending monitoring.")
     return 0
 
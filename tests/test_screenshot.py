@@ -0,0 +1,314 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+
+from screenshot_renamer import screenshot
+from screenshot_renamer.screenshot import RenamerHandler, _filesystem_type, _move_no_clobber
+
+__author__ = "Jason Nishi"
+__copyright__ = "Jason Nishi"
+__license__ = "MIT"
+
+
+def wait_until(condition, timeout=2.0):
+    """Poll ``condition`` until it's true or ``timeout`` seconds pass."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def renamed_files(directory):
+    return [name for name in os.listdir(directory) if name.startswith("Screenshot-")]
+
+
+@pytest.fixture(autouse=True)
+def fresh_hash_cache(monkeypatch):
+    monkeypatch.setattr(RenamerHandler, "_hash_cache", OrderedDict())
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    monkeypatch.setattr(RenamerHandler, "RENAME_DELAY_SECONDS", 0.2)
+    handler = RenamerHandler()
+    yield handler
+    handler.cancel_pending()
+
+
+@pytest.fixture
+def shot(tmp_path):
+    path = tmp_path / "shot.png"
+    path.write_bytes(b"screenshot data")
+    return str(path)
+
+
+# ---- Debounced renames ----
+
+
+def test_schedule_rename_renames_after_delay(handler, shot, tmp_path):
+    """A scheduled file is renamed once its delay has passed"""
+    handler.schedule_rename(shot)
+    assert handler.is_pending(shot)
+    assert os.path.exists(shot)
+    assert wait_until(lambda: not os.path.exists(shot))
+    assert not handler.is_pending(shot)
+    assert len(renamed_files(tmp_path)) == 1
+
+
+def test_schedule_rename_restarts_wait(handler, shot):
+    """Scheduling a pending file again pushes its rename back"""
+    handler.schedule_rename(shot)
+    time.sleep(0.15)
+    handler.schedule_rename(shot)
+    time.sleep(0.15)
+    # 0.3s after the first schedule, but only 0.15s after the second.
+    assert os.path.exists(shot)
+    assert wait_until(lambda: not os.path.exists(shot))
+
+
+def test_cancel_pending(handler, shot):
+    """Cancelled renames never run"""
+    handler.schedule_rename(shot)
+    handler.cancel_pending()
+    assert not handler.is_pending(shot)
+    time.sleep(0.4)
+    assert os.path.exists(shot)
+
+
+def test_run_pending_renames_on_timer_thread(handler, shot, monkeypatch):
+    """run_pending brings a rename forward without running it on the caller"""
+    monkeypatch.setattr(RenamerHandler, "RENAME_DELAY_SECONDS", 30)
+    threads = []
+    rename_file = handler.rename_file
+
+    def record_thread(path, ext=None):
+        threads.append(threading.current_thread())
+        return rename_file(path, ext)
+
+    monkeypatch.setattr(handler, "rename_file", record_thread)
+    handler.schedule_rename(shot)
+    assert handler.run_pending(shot)
+    assert wait_until(lambda: not os.path.exists(shot))
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_run_pending_without_pending_rename(handler, shot):
+    """Nothing happens for files with no rename scheduled"""
+    assert not handler.run_pending(shot)
+    handler.schedule_rename(shot)
+    assert wait_until(lambda: not os.path.exists(shot))
+    # The timer has already fired; there's nothing left to bring forward.
+    assert not handler.run_pending(shot)
+
+
+def test_superseded_timer_does_not_rename(handler, shot, monkeypatch):
+    """A timer that fires after being replaced leaves the rename to its successor"""
+    monkeypatch.setattr(RenamerHandler, "RENAME_DELAY_SECONDS", 30)
+    handler.schedule_rename(shot)
+    # Simulates an old timer that had already started when it was replaced:
+    # it isn't the timer registered for the path.
+    handler._run_scheduled_rename(shot, None)
+    assert os.path.exists(shot)
+    assert handler.is_pending(shot)
+
+
+def test_rename_file_logs_read_errors(handler, tmp_path):
+    """Unreadable files are reported rather than raising"""
+    directory = tmp_path / "folder.png"
+    directory.mkdir()
+    assert not handler.rename_file(str(directory))
+    assert not handler.rename_file(str(tmp_path / "missing.png"))
+
+
+# ---- Moving files ----
+
+
+def test_move_no_clobber(tmp_path):
+    """Files are moved to their new name"""
+    src, dest = tmp_path / "a.png", tmp_path / "b.png"
+    src.write_text("a")
+    _move_no_clobber(str(src), str(dest))
+    assert not src.exists()
+    assert dest.read_text() == "a"
+
+
+def test_move_no_clobber_collision(tmp_path):
+    """Existing files are never replaced"""
+    src, dest = tmp_path / "a.png", tmp_path / "b.png"
+    src.write_text("a")
+    dest.write_text("b")
+    with pytest.raises(FileExistsError):
+        _move_no_clobber(str(src), str(dest))
+    assert src.read_text() == "a"
+    assert dest.read_text() == "b"
+
+
+def test_move_no_clobber_missing_source(tmp_path):
+    """A missing source is reported as such"""
+    with pytest.raises(FileNotFoundError):
+        _move_no_clobber(str(tmp_path / "a.png"), str(tmp_path / "b.png"))
+
+
+def test_move_no_clobber_rolls_back_failed_unlink(tmp_path, monkeypatch):
+    """If the old name can't be removed, the new link is removed again"""
+    src, dest = tmp_path / "a.png", tmp_path / "b.png"
+    src.write_text("a")
+    unlink = os.unlink
+
+    def failing_unlink(path):
+        if path == str(src):
+            raise PermissionError(13, "Permission denied", path)
+        unlink(path)
+
+    monkeypatch.setattr(screenshot.os, "unlink", failing_unlink)
+    with pytest.raises(PermissionError):
+        _move_no_clobber(str(src), str(dest))
+    assert src.exists()
+    assert not dest.exists()
+
+
+def test_move_no_clobber_source_already_unlinked(tmp_path, monkeypatch):
+    """The move is done if the old name vanished after linking"""
+    src, dest = tmp_path / "a.png", tmp_path / "b.png"
+    src.write_text("a")
+
+    def vanished(path):
+        raise FileNotFoundError(2, "No such file or directory", path)
+
+    monkeypatch.setattr(screenshot.os, "unlink", vanished)
+    _move_no_clobber(str(src), str(dest))
+    assert dest.read_text() == "a"
+
+
+def test_move_no_clobber_without_hard_links(tmp_path, monkeypatch):
+    """Filesystems without hard links fall back to a checked rename"""
+
+    def no_links(src, dest):
+        raise PermissionError(1, "Operation not permitted", src)
+
+    monkeypatch.setattr(screenshot.os, "link", no_links)
+    src, dest, other = tmp_path / "a.png", tmp_path / "b.png", tmp_path / "c.png"
+    src.write_text("a")
+    other.write_text("c")
+    with pytest.raises(FileExistsError):
+        _move_no_clobber(str(src), str(other))
+    _move_no_clobber(str(src), str(dest))
+    assert not src.exists()
+    assert dest.read_text() == "a"
+    assert other.read_text() == "c"
+
+
+# ---- Filesystem detection ----
+
+
+MOUNTS = """\
+/dev/sda1 / ext4 rw,relatime 0 0
+server:/export /mnt nfs4 rw,relatime 0 0
+/dev/sdb1 /mnt/local ext4 rw,relatime 0 0
+//host/share /mnt/my\\040share cifs rw,relatime 0 0
+"""
+
+
+@pytest.mark.parametrize(
+    "path, fstype",
+    [
+        ("/home/user/Pictures", "ext4"),
+        ("/mnt", "nfs4"),
+        ("/mnt/shots", "nfs4"),
+        ("/mnt/local/shots", "ext4"),
+        ("/mnt/localish", "nfs4"),
+        ("/mnt/my share/shots", "cifs"),
+    ],
+)
+def test_filesystem_type(tmp_path, path, fstype):
+    """The longest matching mount point decides, with octal escapes decoded"""
+    mounts = tmp_path / "mounts"
+    mounts.write_text(MOUNTS)
+    assert _filesystem_type(path, str(mounts)) == fstype
+
+
+def test_filesystem_type_without_mount_table(tmp_path):
+    """Unknown when there's no mount table to read"""
+    assert _filesystem_type("/", str(tmp_path / "missing")) is None
+
+
+# ---- Filenames ----
+
+
+@pytest.mark.parametrize(
+    "name, needs_rename",
+    [
+        ("Screenshot-20261015-070012-874e63cb.png", False),
+        ("/some/dir/Screenshot-20261015-070012-874E63CB.JPEG", False),
+        ("Screenshot-20261015-070012-874e63cb.png.png", True),
+        ("Screenshot-20261015-070012-874e63cb", True),
+        ("Screenshot-20261015-070012-874e63c.png", True),
+        ("Screenshot 2026-10-15 at 07.00.12.png", True),
+        ("shot.png", True),
+    ],
+)
+def test_needs_rename(name, needs_rename):
+    """Only names matching the whole pattern count as already renamed"""
+    assert RenamerHandler.needs_rename(name) is needs_rename
+
+
+# ---- Checksums ----
+
+
+@pytest.mark.parametrize("size", [0, 5, 7, 8, 100])
+def test_checksum_partial(tmp_path, monkeypatch, size):
+    """The partial checksum covers the whole file, across multiple reads"""
+    monkeypatch.setattr(RenamerHandler, "READ_BYTES_FOR_HASH", 7)
+    path = tmp_path / "shot.png"
+    data = os.urandom(size)
+    path.write_bytes(data)
+    expected = hashlib.sha256(data).hexdigest()[-8:]
+    assert RenamerHandler.checksum_partial(str(path)) == expected
+
+
+def test_checksum_partial_cached(tmp_path, monkeypatch):
+    """Unchanged files reuse their checksum; changed files are hashed again"""
+    path = tmp_path / "shot.png"
+    path.write_bytes(b"first")
+    first = RenamerHandler.checksum_partial(str(path))
+
+    def no_hashing(*args):
+        raise AssertionError("hashed again")
+
+    monkeypatch.setattr(screenshot, "_sha256", no_hashing)
+    assert RenamerHandler.checksum_partial(str(path)) == first
+
+    monkeypatch.undo()
+    path.write_bytes(b"second, and longer")
+    assert RenamerHandler.checksum_partial(str(path)) == (
+        hashlib.sha256(b"second, and longer").hexdigest()[-8:]
+    )
+
+
+def test_checksum_partial_cache_evicts_oldest(tmp_path, monkeypatch):
+    """The cache holds at most HASH_CACHE_SIZE entries"""
+    monkeypatch.setattr(RenamerHandler, "HASH_CACHE_SIZE", 2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.png"
+        path.write_text(str(i))
+        paths.append(str(path))
+        RenamerHandler.checksum_partial(str(path))
+    assert len(RenamerHandler._hash_cache) == 2
+    st = os.stat(paths[0])
+    assert (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size) not in RenamerHandler._hash_cache
+
+
+def test_hash_buffers_capped(tmp_path, monkeypatch):
+    """Idle read buffers beyond HASH_BUFFERS_KEPT are freed"""
+    monkeypatch.setattr(RenamerHandler, "_hash_buffers", [])
+    monkeypatch.setattr(RenamerHandler, "HASH_BUFFERS_KEPT", 1)
+    with RenamerHandler._hash_buffer(), RenamerHandler._hash_buffer():
+        pass
+    assert len(RenamerHandler._hash_buffers) == 1